@@ -5,14 +5,27 @@ Optimized for minimal OpenAI API usage.
 """
 
 import streamlit as st
-from PyPDF2 import PdfReader
-import docx
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+import fitz  # PyMuPDF
+import zipfile
+import lxml.etree as ET
+import io
 import json
 import os
-from openai import OpenAI
 import random
-import os
+import re
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from openai import OpenAI, AsyncOpenAI
+import numpy as np
+import pandas as pd
+from numba import njit
 from dotenv import load_dotenv
+from pdf_workers import init_worker, extract_pages
 load_dotenv()
 
 # ========================================
@@ -34,19 +47,29 @@ if 'quiz_generated' not in st.session_state:
     st.session_state.quiz_generated = False
 if 'mcqs' not in st.session_state:
     st.session_state.mcqs = []
-if 'user_answers' not in st.session_state:
-    st.session_state.user_answers = {}
 if 'quiz_submitted' not in st.session_state:
     st.session_state.quiz_submitted = False
 if 'extracted_text' not in st.session_state:
     st.session_state.extracted_text = ""
 if 'sentences' not in st.session_state:
     st.session_state.sentences = []
+if 'batch_id' not in st.session_state:
+    st.session_state.batch_id = None
+if 'batch_questions' not in st.session_state:
+    st.session_state.batch_questions = 0
 
 # ========================================
 # OPENAI API CONFIGURATION
 # ========================================
 
+@st.cache_resource(show_spinner=False)
+def _build_client(api_key):
+    """
+    Build an OpenAI client once per API key.
+    The client and its HTTP connection pool are reused across reruns.
+    """
+    return OpenAI(api_key=api_key)
+
 def get_openai_client():
     """
     Initialize OpenAI client with API key from environment variable or user input.
@@ -65,7 +88,7 @@ def get_openai_client():
     
     if api_key:
         try:
-            client = OpenAI(api_key=api_key)  # FIXED: Pass as variable, not literal
+            client = _build_client(api_key)
             st.sidebar.success("✅ API Key configured")
             return client
         except Exception as e:
@@ -76,42 +99,123 @@ def get_openai_client():
 # TEXT EXTRACTION FUNCTIONS (NO AI)
 # ========================================
 
+# PDFs with at least this many pages are extracted in parallel
+PARALLEL_PDF_MIN_PAGES = 50
+PDF_PAGES_PER_CHUNK = 5
+
+def extract_pdf_pages_parallel(pdf_bytes, total_pages):
+    """
+    Extract PDF page text across worker processes in chunks of pages.
+    Uses spawned processes, which are safe alongside Streamlit's server threads.
+    
+    Returns:
+        List of page texts in page order
+    """
+    chunks = [
+        (start, min(start + PDF_PAGES_PER_CHUNK, total_pages))
+        for start in range(0, total_pages, PDF_PAGES_PER_CHUNK)
+    ]
+    
+    with ProcessPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, len(chunks)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(pdf_bytes,)
+    ) as executor:
+        futures = [executor.submit(extract_pages, start, end) for start, end in chunks]
+        
+        # Collect in submission order to keep pages in reading order
+        text_parts = []
+        for future in futures:
+            text_parts.extend(future.result())
+    
+    return text_parts
+
 def extract_text_from_pdf(file):
     """
-    Extract text from PDF file using PyPDF2.
+    Extract text from PDF file using PyMuPDF.
+    Large PDFs are split across processes; small ones are read sequentially
+    to avoid process startup overhead.
     Manual extraction - no AI used.
     """
-    text = ""
     try:
-        pdf = PdfReader(file)
-        total_pages = len(pdf.pages)
+        # Open from in-memory bytes - no temp file needed
+        pdf_bytes = file.read()
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            total_pages = len(doc)
+            if total_pages < PARALLEL_PDF_MIN_PAGES:
+                text_parts = [page.get_text() for page in doc]
         
-        for page_num, page in enumerate(pdf.pages, 1):
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+        if total_pages >= PARALLEL_PDF_MIN_PAGES:
+            text_parts = extract_pdf_pages_parallel(pdf_bytes, total_pages)
         
-        return text, total_pages
+        return "\n".join(text_parts), total_pages
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return "", 0
 
+# WordprocessingML element tags
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_PARAGRAPH = _W_NS + "p"
+_W_RUN = _W_NS + "r"
+_W_TEXT = _W_NS + "t"
+_W_BREAK = _W_NS + "br"
+_W_BREAK_TYPE = _W_NS + "type"
+
+# Run content rendered as fixed text, matching python-docx's paragraph text
+_W_RUN_CHARS = {
+    _W_NS + "tab": "\t",
+    _W_NS + "ptab": "\t",
+    _W_NS + "cr": "\n",
+    _W_NS + "noBreakHyphen": "-",
+}
+
+def docx_paragraph_text(paragraph):
+    """
+    Join the text of a w:p element's runs.
+    Only run content is used, so field codes, deleted text and tab-stop
+    definitions in paragraph properties are skipped.
+    """
+    parts = []
+    for run in paragraph.iter(_W_RUN):
+        for child in run:
+            if child.tag == _W_TEXT:
+                parts.append(child.text or "")
+            elif child.tag == _W_BREAK:
+                # Line breaks become newlines; page and column breaks add nothing
+                if child.get(_W_BREAK_TYPE, "textWrapping") == "textWrapping":
+                    parts.append("\n")
+            elif child.tag in _W_RUN_CHARS:
+                parts.append(_W_RUN_CHARS[child.tag])
+    
+    return "".join(parts)
+
 def extract_text_from_docx(file):
     """
-    Extract text from DOCX file using python-docx.
+    Extract text from DOCX file by streaming word/document.xml with lxml.
+    Paragraphs are freed as soon as they are read, so memory stays bounded.
+    Unlike python-docx's doc.paragraphs, paragraphs inside table cells are
+    included too, so table content can become learning points.
     Manual extraction - no AI used.
     """
-    text = ""
     try:
-        doc = docx.Document(file)
-        para_count = 0
+        text_parts = []
         
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text += para.text + "\n"
-                para_count += 1
+        with zipfile.ZipFile(file) as archive, archive.open("word/document.xml") as xml_file:
+            # Uploaded XML is untrusted: never expand entities or fetch
+            # external resources (python-docx parses the same way)
+            for _, elem in ET.iterparse(xml_file, tag=_W_PARAGRAPH,
+                                        resolve_entities=False, no_network=True):
+                para_text = docx_paragraph_text(elem)
+                if para_text.strip():
+                    text_parts.append(para_text)
+                
+                # Free the parsed paragraph and already-processed siblings
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
         
-        return text, para_count
+        return "\n".join(text_parts), len(text_parts)
     except Exception as e:
         st.error(f"Error reading DOCX: {str(e)}")
         return "", 0
@@ -122,13 +226,17 @@ def extract_text_from_txt(file):
     Manual extraction - no AI used.
     """
     try:
-        text = file.read().decode("utf-8")
-        line_count = len([line for line in text.split("\n") if line.strip()])
+        raw = file.read()
+        # Replace undecodable bytes instead of rejecting non-UTF-8 files
+        text = raw.decode("utf-8", errors="replace")
+        # Counting newlines on the bytes avoids building a list of every line
+        line_count = raw.count(b"\n") + (1 if raw and not raw.endswith(b"\n") else 0)
         return text, line_count
     except Exception as e:
         st.error(f"Error reading TXT: {str(e)}")
         return "", 0
 
+@st.cache_data(hash_funcs={UploadedFile: lambda f: f.getvalue()}, show_spinner=False)
 def extract_text(file):
     """
     Main text extraction function that handles all file types.
@@ -150,6 +258,12 @@ def extract_text(file):
 # TEXT CLEANING FUNCTIONS (NO AI)
 # ========================================
 
+# Split after sentence punctuation or on line breaks
+_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\r?\n+')
+# Characters that are neither word characters nor whitespace
+_SPECIAL_RE = re.compile(r'[^\w\s]')
+
+@st.cache_data(show_spinner=False)
 def clean_and_split_text(text, min_length=30, max_length=300):
     """
     Clean extracted text and split into meaningful sentences.
@@ -163,61 +277,564 @@ def clean_and_split_text(text, min_length=30, max_length=300):
     Returns:
         List of cleaned sentences
     """
-    # Split by newlines and periods
-    lines = text.replace(". ", ".\n").split("\n")
+    # Split by newlines and sentence endings, then filter all lines at once
+    # with vectorized pandas string operations (object dtype so the
+    # pre-compiled regexes are used as-is)
+    lines = pd.Series(_SPLIT_RE.split(text), dtype=object).str.strip()
+    lengths = lines.str.len()
+    special_counts = lines.str.count(_SPECIAL_RE)  # Reuses the compiled pattern
     
-    cleaned_sentences = []
+    # Remove empty lines and very short lines
+    keep = lengths >= min_length
     
-    for line in lines:
-        # Strip whitespace
-        line = line.strip()
-        
-        # Remove empty lines and very short lines
-        if len(line) < min_length:
+    # Skip lines that are likely headers/footers (all caps, too short, etc.)
+    keep &= ~((lengths < 50) & lines.str.isupper())
+    
+    # Skip lines with too many special characters
+    keep &= (special_counts / lengths) <= 0.3
+    
+    lines = lines[keep]
+    lengths = lengths[keep]
+    
+    # Truncate very long sentences
+    lines = lines.where(lengths <= max_length, lines.str.slice(0, max_length) + "...")
+    
+    return lines.tolist()
+
+# ========================================
+# LEARNING POINT SELECTION (NO AI)
+# ========================================
+
+@njit(cache=True)
+def score_sentences(codes, offsets):
+    """
+    Score how quizzable each sentence is from its UTF-8 bytes.
+    Works on a byte array because Numba's string support is limited.
+    
+    Args:
+        codes: uint8 array of all sentences' bytes concatenated
+        offsets: int64 array where sentence i spans codes[offsets[i]:offsets[i+1]]
+    
+    Returns:
+        float64 array with one score per sentence (higher is better)
+    """
+    n = offsets.shape[0] - 1
+    scores = np.zeros(n, dtype=np.float64)
+    
+    for s in range(n):
+        start = offsets[s]
+        end = offsets[s + 1]
+        length = end - start
+        if length == 0:
             continue
         
-        # Skip lines that are likely headers/footers (all caps, too short, etc.)
-        if line.isupper() and len(line) < 50:
-            continue
+        letters = 0
+        uppercase = 0
+        digits = 0
+        repeats = 0
+        for j in range(start, end):
+            c = codes[j]
+            if 65 <= c <= 90:
+                letters += 1
+                uppercase += 1
+            elif 97 <= c <= 122:
+                letters += 1
+            elif 48 <= c <= 57:
+                digits += 1
+            
+            # Runs of 3+ identical characters (dot leaders, rules, etc.)
+            if j >= start + 2 and c == codes[j - 1] and c == codes[j - 2]:
+                repeats += 1
         
-        # Skip lines with too many special characters
-        special_char_ratio = sum(not c.isalnum() and not c.isspace() for c in line) / len(line)
-        if special_char_ratio > 0.3:
-            continue
+        score = letters / length  # Prose is mostly letters
+        
+        # Sentences long enough to carry a fact but not run-on
+        if 80 <= length <= 250:
+            score += 1.0
         
-        # Truncate very long sentences
-        if len(line) > max_length:
-            line = line[:max_length] + "..."
+        # Some proper nouns/acronyms, but not a shouted header
+        uppercase_ratio = uppercase / length
+        if 0.02 <= uppercase_ratio <= 0.15:
+            score += 1.0
         
-        cleaned_sentences.append(line)
+        # Numbers usually mean dates, quantities or other testable facts
+        if digits > 0:
+            score += 0.5
+        
+        score -= 5.0 * repeats / length
+        scores[s] = score
     
-    return cleaned_sentences
+    return scores
+
+def rank_learning_points(sentences, limit):
+    """
+    Rank sentences by how quizzable they are, to spend API calls on the best ones.
+    
+    Args:
+        sentences: List of learning points
+        limit: Maximum number of sentences to rank
+    
+    Returns:
+        List of up to limit sentence indices, most quizzable first
+    """
+    if not sentences or limit <= 0:
+        return []
+    
+    # Pack all sentences into one contiguous byte array plus offsets
+    encoded = [sentence.encode("utf-8") for sentence in sentences]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    codes = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    
+    scores = score_sentences(codes, offsets)
+    if limit < len(sentences):
+        top = np.argpartition(-scores, limit)[:limit]
+    else:
+        top = np.arange(len(sentences))
+    
+    return sorted(top.tolist(), key=lambda i: -scores[i])
+
+def pick_learning_points(sentences, count):
+    """
+    Randomly pick learning points from the top-ranked candidates, so
+    regenerating a quiz does not always ask about the same sentences.
+    
+    Args:
+        sentences: List of learning points
+        count: Number of sentences to pick, from the best 2 x count
+    
+    Returns:
+        List of up to count sentence indices, most quizzable first
+    """
+    candidates = rank_learning_points(sentences, 2 * count)
+    picked = set(random.sample(candidates, min(count, len(candidates))))
+    return [i for i in candidates if i in picked]
 
 # ========================================
 # AI-POWERED MCQ GENERATION (OPENAI API)
 # ========================================
 
-def generate_mcq_with_ai(client, learning_point, temperature=0.7):
+# JSON schema for one MCQ, enforced by OpenAI structured outputs
+MCQ_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question": {"type": "string"},
+        "options": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 4,
+            "maxItems": 4
+        },
+        "correct_answer": {"type": "string"},
+        "explanation": {"type": "string"}
+    },
+    "required": ["question", "options", "correct_answer", "explanation"],
+    "additionalProperties": False
+}
+
+MCQ_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "mcq", "strict": True, "schema": MCQ_SCHEMA}
+}
+
+# Bulk items carry the number of the learning point they answer, since
+# the schema cannot enforce the array length or order
+MCQ_BULK_ITEM_SCHEMA = {
+    **MCQ_SCHEMA,
+    "properties": {"point": {"type": "integer"}, **MCQ_SCHEMA["properties"]},
+    "required": ["point"] + MCQ_SCHEMA["required"]
+}
+
+MCQ_BULK_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "mcq_list",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"mcqs": {"type": "array", "items": MCQ_BULK_ITEM_SCHEMA}},
+            "required": ["mcqs"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Model routing: simple learning points use the cheap model,
+# complex ones escalate to the stronger model
+DEFAULT_MODEL = "gpt-4o-mini"
+ADVANCED_MODEL = "gpt-4o"
+COMPLEXITY_THRESHOLD = 0.6
+
+# Words this long are rare in plain prose but common in technical text
+_LONG_WORD_RE = re.compile(r'[A-Za-z]{9,}')
+_WORD_RE = re.compile(r'[A-Za-z]+')
+
+def complexity_score(sentence):
+    """
+    Cheap estimate of how demanding a learning point is to quiz on.
+    Combines long-word density, length and presence of numbers.
+    Manual calculation - no AI used.
+    
+    Returns:
+        Score from 0 (short, plain) to about 2.35 (long, technical).
+        Everyday prose stays below about 0.4, technical text lands above 0.6.
+    """
+    word_count = len(_WORD_RE.findall(sentence))
+    if not word_count:
+        return 0.0
+    
+    long_word_ratio = len(_LONG_WORD_RE.findall(sentence)) / word_count
+    score = 2 * long_word_ratio + 0.2 * min(len(sentence) / 250, 1.0)
+    
+    # Dates are common in plain prose too, so digits only nudge the score
+    if any(c.isdigit() for c in sentence):
+        score += 0.15
+    
+    return score
+
+def choose_model(sentence, threshold=COMPLEXITY_THRESHOLD):
+    """
+    Pick the OpenAI model for a learning point based on its complexity.
+    """
+    if complexity_score(sentence) < threshold:
+        return DEFAULT_MODEL
+    return ADVANCED_MODEL
+
+def validate_mcq(mcq):
+    """
+    Check that a generated MCQ has the expected structure.
+    
+    Returns:
+        True if the MCQ has a question, 4 distinct options and a matching correct answer
+    """
+    if not isinstance(mcq, dict):
+        return False
+    
+    required_keys = {"question", "options", "correct_answer"}
+    if not required_keys <= mcq.keys():
+        return False
+    
+    options = mcq["options"]
+    if len(options) != 4:
+        return False
+    
+    # Duplicate options make the question solvable by elimination
+    option_set = {option.strip() for option in options}
+    if len(option_set) != 4:
+        return False
+    
+    # Exact match, since scoring compares the chosen option to correct_answer
+    return mcq["correct_answer"] in options
+
+# Static parts of the single-MCQ prompt, built once at module load;
+# each call only concatenates the learning point in between
+_MCQ_PROMPT_PREFIX = """You are an expert quiz creator. Generate ONE multiple-choice question based on the following text:
+
+\""""
+
+_MCQ_PROMPT_SUFFIX = """\"
+
+Return ONLY valid JSON in this exact format (no other text):
+{
+    "question": "Your question here?",
+    "options": ["Option A", "Option B", "Option C", "Option D"],
+    "correct_answer": "Option A",
+    "explanation": "Brief explanation of why this is correct"
+}
+
+Rules:
+- Question must test understanding of the key concept
+- All 4 options must be plausible
+- Only ONE option is correct
+- Options should be concise (under 100 characters each)
+- The correct_answer must exactly match one of the options"""
+
+_SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful quiz generator that outputs only valid JSON."}
+
+def build_mcq_messages(learning_point):
+    """
+    Build the chat messages asking for ONE MCQ about a learning point.
+    Shared by the sequential, parallel and batch generation paths.
+    """
+    prompt = _MCQ_PROMPT_PREFIX + learning_point + _MCQ_PROMPT_SUFFIX
+    
+    return [
+        _SYSTEM_MESSAGE,
+        {"role": "user", "content": prompt}
+    ]
+
+def parse_mcq_content(content):
+    """
+    Parse and validate the JSON content of a single-MCQ response.
+    The response is schema-constrained, so only semantic checks can fail.
+    Raises json.JSONDecodeError if the content is not valid JSON and
+    ValueError if it does not match the expected format.
+    
+    Returns:
+        MCQ dictionary
+    """
+    # Structured outputs return no content when the model refuses
+    if not content:
+        raise ValueError("Model returned no MCQ content")
+    
+    mcq = json.loads(content)
+    
+    if not validate_mcq(mcq):
+        raise ValueError("Generated MCQ did not match expected format")
+    
+    return mcq
+
+# Generated MCQs are reused for an hour, keeping at most this many
+MCQ_CACHE_TTL = 3600
+MCQ_CACHE_MAX_ENTRIES = 1000
+
+@st.cache_resource(show_spinner=False)
+def _mcq_cache():
+    """
+    Process-wide MCQ cache keyed per (learning_point, temperature, model).
+    Shared by the bulk, parallel and single-question paths, so each learning
+    point is only sent to the API once while its entry is fresh.
+    """
+    return {"entries": OrderedDict(), "lock": threading.Lock()}
+
+def get_cached_mcq(learning_point, temperature, model):
+    """
+    Look up a previously generated MCQ.
+    
+    Returns:
+        MCQ dictionary, or None if missing or expired
+    """
+    cache = _mcq_cache()
+    key = (learning_point, temperature, model)
+    
+    with cache["lock"]:
+        entry = cache["entries"].get(key)
+        if entry is None:
+            return None
+        
+        stored_at, mcq = entry
+        if time.monotonic() - stored_at > MCQ_CACHE_TTL:
+            del cache["entries"][key]
+            return None
+        
+        cache["entries"].move_to_end(key)
+        return mcq
+
+def cache_mcq(learning_point, temperature, model, mcq):
+    """
+    Store a valid MCQ, evicting the least recently used entries when full.
+    Only valid MCQs are stored, so failures are always retried.
+    """
+    cache = _mcq_cache()
+    key = (learning_point, temperature, model)
+    
+    with cache["lock"]:
+        cache["entries"][key] = (time.monotonic(), mcq)
+        cache["entries"].move_to_end(key)
+        while len(cache["entries"]) > MCQ_CACHE_MAX_ENTRIES:
+            cache["entries"].popitem(last=False)
+
+# Report a streamed preview every this many chunks
+STREAM_PREVIEW_EVERY = 8
+
+def generate_mcq_with_ai(client, learning_point, temperature=0.7, model=DEFAULT_MODEL, on_delta=None):
     """
     Generate a single MCQ from a learning point using OpenAI API.
-    This is the ONLY function that uses AI.
+    Cached MCQs are returned without an API call; otherwise the response
+    is streamed so progress is visible before it completes.
     
     Args:
         client: OpenAI client instance
         learning_point: Text content to generate MCQ from
         temperature: Creativity level (0-1)
+        model: OpenAI model name (see choose_model)
+        on_delta: Optional callback receiving the content streamed so far
     
     Returns:
         Dictionary with question, options, and correct answer
         or None if generation fails
     """
+    mcq = get_cached_mcq(learning_point, temperature, model)
+    if mcq:
+        return mcq
+    
     try:
-        prompt = f"""You are an expert quiz creator. Generate ONE multiple-choice question based on the following text:
+        stream = client.chat.completions.create(
+            model=model,
+            messages=build_mcq_messages(learning_point),
+            temperature=temperature,
+            max_tokens=300,  # Limit tokens for cost efficiency
+            response_format=MCQ_RESPONSE_FORMAT,
+            stream=True
+        )
+        
+        content_parts = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content_parts.append(delta)
+                if on_delta and len(content_parts) % STREAM_PREVIEW_EVERY == 0:
+                    on_delta("".join(content_parts))
+        
+        # Schema-constrained output, so the full buffer parses as-is
+        mcq = parse_mcq_content("".join(content_parts))
+        cache_mcq(learning_point, temperature, model, mcq)
+        return mcq
+        
+    except json.JSONDecodeError as e:
+        st.warning(f"Failed to parse AI response as JSON: {str(e)}")
+        return None
+    except ValueError as e:
+        st.warning(str(e))
+        return None
+    except Exception as e:
+        st.error(f"Error generating MCQ: {str(e)}")
+        return None
 
-"{learning_point}"
+async def generate_mcq_with_ai_async(client, learning_point, temperature=0.7, model=DEFAULT_MODEL, on_delta=None):
+    """
+    Async version of generate_mcq_with_ai for concurrent generation.
+    Cached MCQs are returned without an API call; otherwise the response
+    is streamed so progress is visible before it completes.
+    
+    Args:
+        client: AsyncOpenAI client instance
+        learning_point: Text content to generate MCQ from
+        temperature: Creativity level (0-1)
+        model: OpenAI model name (see choose_model)
+        on_delta: Optional callback receiving the content streamed so far
+    
+    Returns:
+        Dictionary with question, options, and correct answer
+        or None if generation fails
+    """
+    mcq = get_cached_mcq(learning_point, temperature, model)
+    if mcq:
+        return mcq
+    
+    try:
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=build_mcq_messages(learning_point),
+            temperature=temperature,
+            max_tokens=300,  # Limit tokens for cost efficiency
+            response_format=MCQ_RESPONSE_FORMAT,
+            stream=True
+        )
+        
+        content_parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content_parts.append(delta)
+                if on_delta and len(content_parts) % STREAM_PREVIEW_EVERY == 0:
+                    on_delta("".join(content_parts))
+        
+        # Schema-constrained output, so the full buffer parses as-is
+        mcq = parse_mcq_content("".join(content_parts))
+        cache_mcq(learning_point, temperature, model, mcq)
+        return mcq
+        
+    except json.JSONDecodeError as e:
+        st.warning(f"Failed to parse AI response as JSON: {str(e)}")
+        return None
+    except ValueError as e:
+        st.warning(str(e))
+        return None
+    except Exception as e:
+        st.error(f"Error generating MCQ: {str(e)}")
+        return None
 
-Return ONLY valid JSON in this exact format (no other text):
+async def generate_mcqs_parallel(api_key, sentences, models, needed=None, on_progress=None, on_preview=None):
+    """
+    Generate one MCQ per learning point with all API calls in flight at once.
+    Once `needed` valid MCQs have arrived the remaining calls are cancelled.
+    The async client is created per run because it is bound to the event loop.
+    
+    Args:
+        api_key: OpenAI API key
+        sentences: List of learning points
+        models: OpenAI model name for each learning point
+        needed: Optional number of valid MCQs after which to stop early
+        on_progress: Optional callback receiving the number of valid MCQs so far
+        on_preview: Optional callback receiving (question index, content streamed so far)
+    
+    Returns:
+        List with one MCQ dictionary (or None if generation failed or was
+        cancelled) per learning point
+    """
+    def preview_for(i):
+        if on_preview is None:
+            return None
+        return lambda content: on_preview(i, content)
+    
+    async with AsyncOpenAI(api_key=api_key) as client:
+        tasks = [
+            asyncio.ensure_future(
+                generate_mcq_with_ai_async(client, sentence, model=model, on_delta=preview_for(i))
+            )
+            for i, (sentence, model) in enumerate(zip(sentences, models))
+        ]
+        
+        # Report progress per completion rather than per submission
+        valid = 0
+        for future in asyncio.as_completed(tasks):
+            if await future:
+                valid += 1
+                if on_progress:
+                    on_progress(valid)
+            if needed is not None and valid >= needed:
+                break
+        
+        # Early stop - cancel the spare calls still in flight
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        return [None if task.cancelled() else task.result() for task in tasks]
+
+def generate_mcqs_bulk(client, sentences, temperature=0.7, model=DEFAULT_MODEL, on_progress=None):
+    """
+    Generate one MCQ per learning point using a single OpenAI API call.
+    The instructions are sent once for the whole batch instead of once per question.
+    Cached learning points are left out of the request; if all are cached
+    no API call is made.
+    
+    Args:
+        client: OpenAI client instance
+        sentences: List of learning points
+        temperature: Creativity level (0-1)
+        model: OpenAI model name (see choose_model)
+        on_progress: Optional callback receiving the number of questions ready so far
+    
+    Returns:
+        List with one MCQ dictionary per learning point, or None where the
+        response was missing, invalid or the request failed
+    """
+    results = [get_cached_mcq(sentence, temperature, model) for sentence in sentences]
+    pending = [i for i, mcq in enumerate(results) if mcq is None]
+    cached_count = len(sentences) - len(pending)
+    
+    if on_progress and cached_count:
+        on_progress(cached_count)
+    if not pending:
+        return results
+    
+    numbered_points = "\n".join(f'{n}. "{sentences[i]}"' for n, i in enumerate(pending, 1))
+    
+    try:
+        prompt = f"""You are an expert quiz creator. Generate ONE multiple-choice question for EACH of the {len(pending)} numbered learning points below:
+
+{numbered_points}
+
+Return ONLY a valid JSON object with a single key "mcqs" holding an array of {len(pending)} objects, one per numbered learning point and in the same order, each in this exact format:
 {{
+    "point": 1,
     "question": "Your question here?",
     "options": ["Option A", "Option B", "Option C", "Option D"],
     "correct_answer": "Option A",
@@ -225,89 +842,285 @@ Return ONLY valid JSON in this exact format (no other text):
 }}
 
 Rules:
-- Question must test understanding of the key concept
+- "point" must be the number of the learning point the question is about
+- Each question must test understanding of the key concept of its learning point
 - All 4 options must be plausible
 - Only ONE option is correct
 - Options should be concise (under 100 characters each)
 - The correct_answer must exactly match one of the options"""
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using GPT-40-mini for cost efficiency
+        stream = client.chat.completions.create(
+            model=model,
             messages=[
-                {"role": "system", "content": "You are a helpful quiz generator that outputs only valid JSON."},
+                _SYSTEM_MESSAGE,
                 {"role": "user", "content": prompt}
             ],
             temperature=temperature,
-            max_tokens=300  # Limit tokens for cost efficiency
+            max_tokens=300 * len(pending),  # Same per-question budget as single calls
+            response_format=MCQ_BULK_RESPONSE_FORMAT,
+            stream=True
         )
         
-        # Extract and parse JSON response
-        content = response.choices[0].message.content.strip()
+        # Accumulate streamed JSON, reporting each question as it completes.
+        # Only the new delta (plus a short tail for split keys) is scanned.
+        marker = '"explanation"'
+        content_parts = []
+        tail = ""
+        completed = 0
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                content_parts.append(delta)
+                window = tail + delta
+                completed += window.count(marker)
+                tail = window[-(len(marker) - 1):]
+                if on_progress:
+                    on_progress(cached_count + completed)
         
-        # Remove markdown code blocks if present
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
+        items = json.loads("".join(content_parts))["mcqs"]
         
-        mcq = json.loads(content.strip())
-        
-        # Validate structure
-        required_keys = ["question", "options", "correct_answer"]
-        if all(key in mcq for key in required_keys):
-            if len(mcq["options"]) == 4:
-                if mcq["correct_answer"] in mcq["options"]:
-                    return mcq
-        
-        st.warning("Generated MCQ did not match expected format")
-        return None
+        # Match each answer to its learning point by number, not position,
+        # so a skipped item cannot shift later answers onto the wrong point
+        for item in items:
+            point = item.get("point")
+            if not isinstance(point, int) or not 1 <= point <= len(pending):
+                continue
+            
+            i = pending[point - 1]
+            mcq = {key: value for key, value in item.items() if key != "point"}
+            if results[i] is None and validate_mcq(mcq):
+                results[i] = mcq
+                cache_mcq(sentences[i], temperature, model, mcq)
         
     except json.JSONDecodeError as e:
         st.warning(f"Failed to parse AI response as JSON: {str(e)}")
-        return None
     except Exception as e:
-        st.error(f"Error generating MCQ: {str(e)}")
-        return None
+        st.error(f"Error generating MCQs: {str(e)}")
+    
+    return results
+
+# Extra learning points submitted up front in parallel and economy modes,
+# so a few failed generations do not shorten the quiz
+SPARE_REQUESTS = 2
 
-def generate_quiz_batch(client, sentences, num_questions=5):
+def generate_quiz_batch(client, sentences, num_questions=5, parallel=False,
+                        complexity_threshold=COMPLEXITY_THRESHOLD):
     """
     Generate multiple MCQs from sentences with progress tracking.
-    Batches API calls efficiently.
+    Learning points are taken from a priority queue of the most quizzable
+    sentences until num_questions MCQs are valid or 2 x num_questions
+    have been attempted.
+    
+    By default all questions for the same model are requested in one API
+    call, and learning points the bulk response misses are retried with
+    dedicated calls before spare sentences are used. In parallel mode a few
+    spare questions are requested concurrently and the first num_questions
+    valid ones are kept; any shortfall is topped up from untried sentences,
+    then by retrying failed ones.
     
     Args:
         client: OpenAI client
         sentences: List of learning points
         num_questions: Number of questions to generate
+        parallel: Use one concurrent API call per question
+        complexity_threshold: Learning points scoring at or above this use the advanced model
     
     Returns:
-        List of MCQ dictionaries
+        List of MCQ dictionaries, in document order
     """
-    mcqs = []
-    
-    # Select random sentences for variety
-    selected_sentences = random.sample(sentences, min(num_questions, len(sentences)))
+    # Priority queue sampled from the most quizzable sentences, with spares for failures
+    queue = pick_learning_points(sentences, 2 * num_questions)
+    models = {i: choose_model(sentences[i], complexity_threshold) for i in queue}
+    generated = {}  # sentence index -> MCQ
     
-    # Progress bar for API calls
+    # Progress bar driven by streamed or completed responses
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i, sentence in enumerate(selected_sentences):
-        status_text.text(f"Generating question {i+1}/{len(selected_sentences)}...")
+    def show_preview(label, content):
+        preview = content.removeprefix('{"question":"')
+        status_text.text(f"{label}: {preview[:40]}…")
+    
+    if parallel:
+        attempted = queue[:num_questions + SPARE_REQUESTS]
+        status_text.text(f"Generating {num_questions} questions in parallel...")
         
-        mcq = generate_mcq_with_ai(client, sentence)
+        def update_progress(done):
+            done = min(done, num_questions)
+            status_text.text(f"Generated question {done}/{num_questions}...")
+            progress_bar.progress(done / num_questions)
         
-        if mcq:
-            mcqs.append(mcq)
+        results = asyncio.run(
+            generate_mcqs_parallel(
+                client.api_key,
+                [sentences[i] for i in attempted],
+                [models[i] for i in attempted],
+                needed=num_questions,
+                on_progress=update_progress,
+                on_preview=lambda i, content: show_preview(f"Q{i+1}", content)
+            )
+        )
+        generated.update((i, mcq) for i, mcq in zip(attempted, results) if mcq)
+        
+        # Untried sentences first, then retry the points that failed
+        fallback = queue[len(attempted):] + [i for i in attempted if i not in generated]
+    else:
+        attempted = queue[:num_questions]
+        status_text.text(f"Generating {num_questions} questions in a single request...")
+        
+        def update_progress(done):
+            done = min(done, num_questions)
+            status_text.text(f"Generating question {min(done + 1, num_questions)}/{num_questions}...")
+            progress_bar.progress(done / num_questions)
+        
+        # One bulk request per model
+        completed = 0
+        for model in dict.fromkeys(models[i] for i in attempted):
+            group = [i for i in attempted if models[i] == model]
+            group_size = len(group)
+            
+            group_results = generate_mcqs_bulk(
+                client,
+                [sentences[i] for i in group],
+                model=model,
+                on_progress=lambda done, base=completed, size=group_size: update_progress(base + min(done, size))
+            )
+            generated.update((i, mcq) for i, mcq in zip(group, group_results) if mcq)
+            
+            completed += group_size
         
-        # Update progress
-        progress_bar.progress((i + 1) / len(selected_sentences))
+        # Retry points the bulk response missed individually, then move on to spares
+        fallback = [i for i in attempted if i not in generated] + queue[len(attempted):]
+    
+    # Top up until the quiz is full or 2 x num_questions attempts are spent.
+    # The budget is based on attempts, not queue length, so short documents
+    # still get every miss retried.
+    for i in fallback[:2 * num_questions - len(attempted)]:
+        if len(generated) >= num_questions:
+            break
+        
+        label = f"Replacement question {len(generated) + 1}/{num_questions}"
+        status_text.text(f"Generating {label.lower()}...")
+        mcq = generate_mcq_with_ai(
+            client,
+            sentences[i],
+            model=models[i],
+            on_delta=lambda content, label=label: show_preview(label, content)
+        )
+        if mcq:
+            generated[i] = mcq
+            progress_bar.progress(min(len(generated), num_questions) / num_questions)
     
     progress_bar.empty()
     status_text.empty()
     
-    return mcqs
+    # Keep the highest-priority MCQs, presented in document order
+    kept = sorted(generated, key=queue.index)[:num_questions]
+    return [generated[i] for i in sorted(kept)]
+
+def generate_quiz_batch_async(client, sentences, num_questions=5,
+                              complexity_threshold=COMPLEXITY_THRESHOLD):
+    """
+    Submit MCQ generation as an OpenAI Batch API job (economy mode).
+    Batch jobs cost 50% less and complete within 24 hours.
+    
+    Args:
+        client: OpenAI client
+        sentences: List of learning points
+        num_questions: Number of questions to generate
+        complexity_threshold: Learning points scoring at or above this use the advanced model
+    
+    Returns:
+        Batch job ID, or None if submission fails
+    """
+    # A sample of the most quizzable sentences, best first, with spares in case some fail
+    queue = pick_learning_points(sentences, num_questions + SPARE_REQUESTS)
+    selected_sentences = [sentences[i] for i in queue]
+    
+    # One chat completion request per learning point, in JSONL format
+    requests = [
+        json.dumps({
+            "custom_id": f"q-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": choose_model(sentence, complexity_threshold),
+                "messages": build_mcq_messages(sentence),
+                "temperature": 0.7,
+                "max_tokens": 300,
+                "response_format": MCQ_RESPONSE_FORMAT
+            }
+        })
+        for i, sentence in enumerate(selected_sentences)
+    ]
+    batch_file = io.BytesIO("\n".join(requests).encode("utf-8"))
+    
+    try:
+        input_file = client.files.create(file=("quiz_batch.jsonl", batch_file), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    except Exception as e:
+        st.error(f"Error submitting batch job: {str(e)}")
+        return None
+
+# Batch states that may come with an output file of finished requests
+BATCH_OUTPUT_STATUSES = ("completed", "expired", "cancelled")
+
+def fetch_batch_results(client, batch_id, num_questions=5):
+    """
+    Check an economy-mode batch job and parse its MCQs once it has finished.
+    Expired and cancelled jobs still return the requests that completed
+    before they stopped.
+    
+    Args:
+        client: OpenAI client
+        batch_id: ID returned by generate_quiz_batch_async
+        num_questions: Number of valid MCQs to keep, highest priority first
+    
+    Returns:
+        Tuple of (batch status, list of MCQ dictionaries or None if no output yet)
+    """
+    try:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status not in BATCH_OUTPUT_STATUSES:
+            return batch.status, None
+        
+        # No request succeeded - results only exist in the error file
+        if not batch.output_file_id:
+            return batch.status, []
+        
+        output = client.files.content(batch.output_file_id).text
+    except Exception as e:
+        st.error(f"Error checking batch job: {str(e)}")
+        return "error", None
+    
+    results = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        
+        # Skip malformed or failed records rather than failing the whole batch
+        try:
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            
+            rank = int(record["custom_id"].split("-")[1])
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[rank] = parse_mcq_content(content)
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError):
+            continue
+    
+    # Output order is not guaranteed - restore the submission (priority) order
+    mcqs = [results[rank] for rank in sorted(results)]
+    return batch.status, mcqs[:num_questions]
 
 # ========================================
 # QUIZ UI COMPONENTS
@@ -316,32 +1129,50 @@ def generate_quiz_batch(client, sentences, num_questions=5):
 def display_quiz(mcqs):
     """
     Display quiz questions with radio buttons for answers.
+    Questions are wrapped in a form, so answer clicks do not rerun
+    the script until the quiz is submitted.
+    
+    Returns:
+        True if the submit button was pressed on this run
     """
     st.subheader("📝 Quiz Time!")
     st.write(f"Answer all {len(mcqs)} questions and submit to see your score.")
     
     st.markdown("---")
     
-    for i, mcq in enumerate(mcqs):
-        st.markdown(f"### Question {i+1}")
-        st.write(mcq['question'])
-        
-        # Radio button for answer selection
-        answer = st.radio(
-            "Choose your answer:",
-            mcq['options'],
-            key=f"q_{i}",
-            index=None  # No default selection
-        )
-        
-        # Store answer in session state
-        st.session_state.user_answers[i] = answer
+    with st.form("quiz_form", clear_on_submit=False):
+        for i, mcq in enumerate(mcqs):
+            st.markdown(f"### Question {i+1}")
+            st.write(mcq['question'])
+            
+            # Radio button for answer selection (stored in session state under its key)
+            st.radio(
+                "Choose your answer:",
+                mcq['options'],
+                key=f"q_{i}",
+                index=None  # No default selection
+            )
+            
+            st.markdown("---")
         
-        st.markdown("---")
+        # Submit button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            submitted = st.form_submit_button("📤 Submit Quiz", type="primary", use_container_width=True)
+    
+    return submitted
 
-def calculate_score(mcqs, user_answers):
+def clear_answers():
+    """
+    Remove stored radio answers so a new quiz starts unanswered.
+    """
+    for key in [key for key in st.session_state if str(key).startswith("q_")]:
+        del st.session_state[key]
+
+def calculate_score(mcqs):
     """
     Calculate quiz score and identify weak areas.
+    Answers are read from the quiz radio widgets' session state.
     Manual calculation - no AI used.
     
     Returns:
@@ -351,7 +1182,7 @@ def calculate_score(mcqs, user_answers):
     wrong_questions = []
     
     for i, mcq in enumerate(mcqs):
-        user_answer = user_answers.get(i)
+        user_answer = st.session_state.get(f"q_{i}")
         correct_answer = mcq['correct_answer']
         
         if user_answer == correct_answer:
@@ -450,10 +1281,35 @@ def main():
             min_value=3,
             max_value=15,
             value=5,
-            help="More questions = more API calls"
+            help="More questions = more tokens per API call"
         )
         
-        st.info(f"💡 This will make ~{num_questions} API calls")
+        generation_mode = st.radio(
+            "Generation Mode",
+            ["Single request", "Parallel requests", "Economy (Batch API)"],
+            help="Single request sends all questions in one API call. "
+                 "Parallel requests make one concurrent API call per question. "
+                 "Economy submits a batch job: 50% cheaper, ready within 24 hours."
+        )
+        parallel = generation_mode == "Parallel requests"
+        economy = generation_mode == "Economy (Batch API)"
+        
+        complexity_threshold = st.slider(
+            "GPT-4o Escalation Threshold",
+            min_value=0.0,
+            max_value=2.5,
+            value=COMPLEXITY_THRESHOLD,
+            step=0.1,
+            help="Learning points scoring at or above this complexity use GPT-4o instead of GPT-4o-mini. "
+                 "Raise it to keep costs down; 2.5 always uses GPT-4o-mini."
+        )
+        
+        if parallel:
+            st.info(f"💡 This will make ~{num_questions + SPARE_REQUESTS} concurrent API calls")
+        elif economy:
+            st.info(f"💡 This will submit 1 batch job of {num_questions + SPARE_REQUESTS} requests at half price")
+        else:
+            st.info(f"💡 This will make 1-2 API calls (one per model) for {num_questions} questions, plus retries for any misses")
         
         st.markdown("---")
         
@@ -471,7 +1327,7 @@ def main():
         with st.expander("ℹ️ About"):
             st.markdown("""
             **FlashQuiz+** uses:
-            - Manual text extraction (PyPDF2, python-docx)
+            - Manual text extraction (PyMuPDF, lxml)
             - AI for MCQ generation only
             - Minimal API usage for cost efficiency
             
@@ -525,7 +1381,15 @@ def main():
                 if not client:
                     st.error("⚠️ Please configure OpenAI API key in the sidebar to generate quiz")
                 else:
-                    if st.button("🚀 Generate AI Quiz", type="primary"):
+                    if economy:
+                        if st.button("📦 Submit Economy Batch", type="primary"):
+                            with st.spinner("📦 Submitting batch job..."):
+                                batch_id = generate_quiz_batch_async(client, sentences, num_questions, complexity_threshold)
+                            
+                            if batch_id:
+                                st.session_state.batch_id = batch_id
+                                st.session_state.batch_questions = num_questions
+                    elif st.button("🚀 Generate AI Quiz", type="primary"):
                         if len(sentences) < num_questions:
                             st.warning(f"Only {len(sentences)} learning points found. Generating {len(sentences)} questions.")
                             actual_questions = len(sentences)
@@ -533,46 +1397,74 @@ def main():
                             actual_questions = num_questions
                         
                         with st.spinner(f"🤖 Generating {actual_questions} questions using AI..."):
-                            mcqs = generate_quiz_batch(client, sentences, actual_questions)
+                            mcqs = generate_quiz_batch(
+                                client,
+                                sentences,
+                                actual_questions,
+                                parallel=parallel,
+                                complexity_threshold=complexity_threshold
+                            )
                             
                             if mcqs:
                                 st.session_state.mcqs = mcqs
                                 st.session_state.quiz_generated = True
                                 st.session_state.quiz_submitted = False
-                                st.session_state.user_answers = {}
+                                clear_answers()
                                 st.success(f"✅ Generated {len(mcqs)} questions!")
                             else:
                                 st.error("Failed to generate quiz. Please try again.")
+                    
+                    # Pending economy batch job
+                    if st.session_state.batch_id:
+                        st.info(f"📦 Batch job `{st.session_state.batch_id}` submitted. Results are ready within 24 hours.")
+                        
+                        if st.button("🔄 Check Batch Status"):
+                            with st.spinner("🔄 Checking batch job..."):
+                                status, mcqs = fetch_batch_results(
+                                    client,
+                                    st.session_state.batch_id,
+                                    st.session_state.batch_questions
+                                )
+                            
+                            if mcqs:
+                                st.session_state.mcqs = mcqs
+                                st.session_state.quiz_generated = True
+                                st.session_state.quiz_submitted = False
+                                clear_answers()
+                                st.session_state.batch_id = None
+                                st.rerun()
+                            elif status in ("completed", "failed", "expired", "cancelled"):
+                                st.session_state.batch_id = None
+                                st.error(f"Batch job {status} without usable questions. Please try again.")
+                            elif status != "error":
+                                st.info(f"⏳ Batch status: **{status}**. Check back later.")
                 
                 # Step 4: Take Quiz
                 if st.session_state.quiz_generated and st.session_state.mcqs:
                     st.markdown("---")
                     st.header("4️⃣ Take Quiz")
                     
-                    display_quiz(st.session_state.mcqs)
+                    submitted = display_quiz(st.session_state.mcqs)
                     
-                    # Submit button
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        if st.button("📤 Submit Quiz", type="primary", use_container_width=True):
-                            # Check if all questions are answered
-                            unanswered = []
-                            for i in range(len(st.session_state.mcqs)):
-                                if i not in st.session_state.user_answers or st.session_state.user_answers[i] is None:
-                                    unanswered.append(i + 1)
-                            
-                            if unanswered:
-                                st.warning(f"⚠️ Please answer all questions. Missing: {', '.join(map(str, unanswered))}")
-                            else:
-                                st.session_state.quiz_submitted = True
-                                st.rerun()
+                    if submitted:
+                        # Check if all questions are answered
+                        unanswered = []
+                        for i in range(len(st.session_state.mcqs)):
+                            if st.session_state.get(f"q_{i}") is None:
+                                unanswered.append(i + 1)
+                        
+                        if unanswered:
+                            st.warning(f"⚠️ Please answer all questions. Missing: {', '.join(map(str, unanswered))}")
+                        else:
+                            st.session_state.quiz_submitted = True
+                            st.rerun()
                 
                 # Step 5: Show Results
                 if st.session_state.quiz_submitted:
                     st.markdown("---")
                     st.header("5️⃣ Results & Feedback")
                     
-                    score_data = calculate_score(st.session_state.mcqs, st.session_state.user_answers)
+                    score_data = calculate_score(st.session_state.mcqs)
                     display_results(score_data)
                     
                     # Reset button
@@ -580,7 +1472,7 @@ def main():
                     if st.button("🔄 Start New Quiz", type="secondary"):
                         st.session_state.quiz_generated = False
                         st.session_state.mcqs = []
-                        st.session_state.user_answers = {}
+                        clear_answers()
                         st.session_state.quiz_submitted = False
                         st.rerun()
             else:
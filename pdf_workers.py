@@ -0,0 +1,26 @@
+"""
+Worker functions for parallel PDF text extraction.
+Kept outside app.py because ProcessPoolExecutor must pickle them by
+module path, which does not work for functions defined in a Streamlit script.
+"""
+
+import fitz  # PyMuPDF
+
+# Document opened once per worker process by init_worker
+_doc = None
+
+def init_worker(pdf_bytes):
+    """
+    Open the PDF once per worker so the bytes are only sent to each process once.
+    """
+    global _doc
+    _doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+def extract_pages(start, end):
+    """
+    Extract text from pages [start, end) of the worker's PDF.
+    
+    Returns:
+        List of page texts in page order
+    """
+    return [_doc[page_num].get_text() for page_num in range(start, end)]
@@ -0,0 +1,111 @@
+import io
+import zipfile
+
+import pytest
+
+import app
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def make_docx(document_xml):
+    """Build an in-memory DOCX containing only word/document.xml."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+    buffer.seek(0)
+    return buffer
+
+
+def make_body(body, doctype=""):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'{doctype}<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    )
+
+
+def test_docx_does_not_resolve_external_entities(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("TOPSECRET")
+    doctype = (
+        '<!DOCTYPE w:document ['
+        f'<!ENTITY ext SYSTEM "{secret.as_uri()}">'
+        '<!ENTITY internal "internal-ent">'
+        ']>'
+    )
+    body = '<w:p><w:r><w:t>A &ext; &internal;</w:t></w:r></w:p>'
+
+    text, _ = app.extract_text_from_docx(make_docx(make_body(body, doctype)))
+
+    assert "TOPSECRET" not in text
+    assert "internal-ent" not in text
+
+
+def test_docx_extracts_paragraph_text():
+    body = (
+        '<w:p><w:r><w:t>First paragraph.</w:t></w:r></w:p>'
+        '<w:p/>'
+        '<w:p><w:r><w:t xml:space="preserve">Second </w:t></w:r><w:r><w:t>paragraph.</w:t></w:r></w:p>'
+    )
+
+    text, count = app.extract_text_from_docx(make_docx(make_body(body)))
+
+    assert text == "First paragraph.\nSecond paragraph."
+    assert count == 2
+
+
+def test_docx_keeps_tabs_and_line_breaks():
+    body = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>Alpha</w:t><w:tab/><w:t>Beta</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>Line one</w:t><w:br/><w:t>line two</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>Before</w:t><w:cr/><w:t>after</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>Page</w:t><w:br w:type="page"/><w:t>break</w:t></w:r></w:p>'
+    )
+
+    text, count = app.extract_text_from_docx(make_docx(make_body(body)))
+
+    assert text.split("\n") == ["Alpha\tBeta", "Line one", "line two", "Before", "after", "Pagebreak"]
+    assert count == 4
+
+
+def test_docx_skips_field_codes_and_deleted_text():
+    body = (
+        '<w:p><w:r><w:instrText> PAGE </w:instrText></w:r>'
+        '<w:del><w:r><w:delText>removed </w:delText></w:r></w:del>'
+        '<w:r><w:t>Kept text.</w:t></w:r></w:p>'
+    )
+
+    text, _ = app.extract_text_from_docx(make_docx(make_body(body)))
+
+    assert text == "Kept text."
+
+
+def test_docx_includes_table_cell_paragraphs():
+    body = (
+        '<w:p><w:r><w:t>Intro.</w:t></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:tcPr/><w:p><w:r><w:t>Cell text.</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+    )
+
+    text, count = app.extract_text_from_docx(make_docx(make_body(body)))
+
+    assert text == "Intro.\nCell text."
+    assert count == 2
+
+
+@pytest.mark.parametrize("raw, line_count", [
+    (b"", 0),
+    (b"one line", 1),
+    (b"first\nsecond", 2),
+    (b"first\nsecond\n", 2),
+    (b"first\r\n\r\nthird\r\n", 3),
+])
+def test_txt_line_count(raw, line_count):
+    assert app.extract_text_from_txt(io.BytesIO(raw)) == (raw.decode("utf-8"), line_count)
+
+
+def test_txt_replaces_undecodable_bytes():
+    text, line_count = app.extract_text_from_txt(io.BytesIO(b"caf\xe9\n"))
+
+    assert text == "caf\ufffd\n"
+    assert line_count == 1
@@ -0,0 +1,265 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import app
+
+
+def make_mcq(n):
+    options = [f"Option {n}{letter}" for letter in "ABCD"]
+    return {
+        "question": f"Question {n}?",
+        "options": options,
+        "correct_answer": options[0],
+        "explanation": f"Explanation {n}",
+    }
+
+
+def stream_of(payload):
+    """Yield a JSON payload as streamed chat completion chunks."""
+    content = json.dumps(payload)
+    for start in range(0, len(content), 7):
+        delta = SimpleNamespace(content=content[start:start + 7])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeClient:
+    """Minimal stand-in for the OpenAI client's chat completions API."""
+
+    def __init__(self, bulk_fails=False, drop_points=()):
+        self.bulk_fails = bulk_fails
+        self.drop_points = drop_points
+        self.bulk_calls = []
+        self.single_calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, stream=False, **kwargs):
+        prompt = messages[-1]["content"]
+        if "EACH of the " in prompt:
+            self.bulk_calls.append(prompt)
+            if self.bulk_fails:
+                raise RuntimeError("bulk request failed")
+            count = int(prompt.split("EACH of the ")[1].split()[0])
+            items = [
+                {"point": point, **make_mcq(len(self.bulk_calls) * 100 + point)}
+                for point in range(1, count + 1) if point not in self.drop_points
+            ]
+            return stream_of({"mcqs": items})
+
+        self.single_calls.append(prompt)
+        return stream_of(make_mcq(len(self.single_calls)))
+
+
+@pytest.fixture(autouse=True)
+def empty_mcq_cache():
+    app._mcq_cache()["entries"].clear()
+    yield
+    app._mcq_cache()["entries"].clear()
+
+
+def test_bulk_only_sends_uncached_points():
+    sentences = ["First learning point.", "Second learning point.", "Third learning point."]
+    app.cache_mcq(sentences[1], 0.7, app.DEFAULT_MODEL, make_mcq(1))
+    client = FakeClient()
+
+    results = app.generate_mcqs_bulk(client, sentences)
+
+    assert len(client.bulk_calls) == 1
+    assert sentences[1] not in client.bulk_calls[0]
+    assert results[1] == make_mcq(1)
+    assert all(app.validate_mcq(mcq) for mcq in results)
+
+
+def test_bulk_repeat_generation_makes_no_api_call():
+    sentences = ["First learning point.", "Second learning point."]
+    first = app.generate_mcqs_bulk(FakeClient(), sentences)
+    client = FakeClient()
+
+    second = app.generate_mcqs_bulk(client, sentences)
+
+    assert client.bulk_calls == []
+    assert second == first
+
+
+def test_single_generation_streams_previews():
+    previews = []
+
+    mcq = app.generate_mcq_with_ai(FakeClient(), "A learning point.", on_delta=previews.append)
+
+    assert mcq == make_mcq(1)
+    assert previews and all(json.dumps(mcq).startswith(preview) for preview in previews)
+
+
+def test_failures_are_not_cached():
+    sentences = ["First learning point."]
+
+    assert app.generate_mcqs_bulk(FakeClient(bulk_fails=True), sentences) == [None]
+    assert app.get_cached_mcq(sentences[0], 0.7, app.DEFAULT_MODEL) is None
+
+
+def test_bulk_matches_items_by_point_number():
+    sentences = ["First learning point.", "Second learning point.", "Third learning point.", "Fourth learning point."]
+
+    results = app.generate_mcqs_bulk(FakeClient(drop_points={2}), sentences)
+
+    assert [mcq and mcq["question"] for mcq in results] == ["Question 101?", None, "Question 103?", "Question 104?"]
+    assert all("point" not in mcq for mcq in results if mcq)
+
+
+def test_bulk_caches_only_matched_points():
+    sentences = ["First learning point.", "Second learning point.", "Third learning point."]
+
+    results = app.generate_mcqs_bulk(FakeClient(drop_points={2}), sentences)
+
+    assert app.get_cached_mcq(sentences[1], 0.7, app.DEFAULT_MODEL) is None
+    assert app.get_cached_mcq(sentences[2], 0.7, app.DEFAULT_MODEL) == results[2]
+    assert results[2]["question"] == "Question 103?"
+
+
+def test_validate_mcq_accepts_four_distinct_options():
+    assert app.validate_mcq(make_mcq(1))
+
+
+def test_validate_mcq_rejects_options_differing_only_by_whitespace():
+    mcq = make_mcq(1)
+    mcq["options"][1] = f"  {mcq['options'][0]}\t"
+
+    assert not app.validate_mcq(mcq)
+
+
+class FakeBatchClient:
+    """Stand-in for the OpenAI batches and files APIs with a finished job."""
+
+    def __init__(self, output, status="completed", output_file_id="file-out"):
+        batch = SimpleNamespace(status=status, output_file_id=output_file_id)
+        self.batches = SimpleNamespace(retrieve=lambda batch_id: batch)
+        self.files = SimpleNamespace(content=lambda file_id: SimpleNamespace(text=output))
+
+
+def batch_line(custom_id, content, status_code=200):
+    body = {"choices": [{"message": {"content": content}}]}
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+
+def test_fetch_batch_results_skips_bad_records():
+    output = "\n".join([
+        batch_line("q-2", json.dumps(make_mcq(2))),
+        "{not valid json",
+        batch_line("q-0", json.dumps(make_mcq(0))),
+        batch_line("q-1", json.dumps(make_mcq(1)), status_code=500),
+        json.dumps({"custom_id": "q-3", "response": {"status_code": 200, "body": {"choices": None}}}),
+        json.dumps({"custom_id": "q-4", "response": {"status_code": 200, "body": "unexpected"}}),
+        batch_line("unexpected-id", json.dumps(make_mcq(5))),
+        json.dumps(["not", "an", "object"]),
+        "",
+    ])
+
+    status, mcqs = app.fetch_batch_results(FakeBatchClient(output), "batch-1", num_questions=5)
+
+    assert status == "completed"
+    assert mcqs == [make_mcq(0), make_mcq(2)]
+
+
+def test_fetch_batch_results_keeps_highest_priority():
+    output = "\n".join(batch_line(f"q-{i}", json.dumps(make_mcq(i))) for i in (3, 1, 0, 2))
+
+    _, mcqs = app.fetch_batch_results(FakeBatchClient(output), "batch-1", num_questions=2)
+
+    assert mcqs == [make_mcq(0), make_mcq(1)]
+
+
+@pytest.mark.parametrize("status", ["expired", "cancelled"])
+def test_fetch_batch_results_reads_partial_output(status):
+    output = batch_line("q-1", json.dumps(make_mcq(1)))
+
+    assert app.fetch_batch_results(FakeBatchClient(output, status=status), "batch-1") == (status, [make_mcq(1)])
+
+
+def test_fetch_batch_results_waits_for_running_job():
+    client = FakeBatchClient("", status="in_progress", output_file_id=None)
+
+    assert app.fetch_batch_results(client, "batch-1") == ("in_progress", None)
+
+
+PLAIN_PROSE = [
+    "Plants need sunlight, water and air to grow, and most of them make their own food in their green leaves.",
+    "The French Revolution began in 1789 when ordinary people grew tired of the king and the high price of bread.",
+    "Water boils at a lower temperature on a high mountain because the air pressure there is much lower than at sea level.",
+]
+
+TECHNICAL_TEXT = [
+    "Oxidative phosphorylation couples the electron transport chain to ATP synthesis through a transmembrane proton gradient.",
+    "Asymptotic complexity characterizes algorithmic performance independently of implementation-specific constant factors.",
+    "The Michaelis-Menten equation relates enzymatic reaction velocity to substrate concentration via Vmax and Km.",
+]
+
+
+@pytest.mark.parametrize("sentence", PLAIN_PROSE)
+def test_plain_prose_stays_on_default_model(sentence):
+    assert app.complexity_score(sentence) < app.COMPLEXITY_THRESHOLD
+    assert app.choose_model(sentence) == app.DEFAULT_MODEL
+
+
+@pytest.mark.parametrize("sentence", TECHNICAL_TEXT)
+def test_technical_text_escalates_to_advanced_model(sentence):
+    assert app.complexity_score(sentence) >= app.COMPLEXITY_THRESHOLD
+    assert app.choose_model(sentence) == app.ADVANCED_MODEL
+
+
+def test_slider_maximum_never_escalates():
+    sentence = " ".join(["Electrophoresis"] * 20) + " 1234"
+
+    assert app.choose_model(sentence, threshold=2.5) == app.DEFAULT_MODEL
+
+
+def quiz_sentences(count):
+    return [f"Learning point number {n} describes a distinct fact about the topic." for n in range(count)]
+
+
+@pytest.mark.parametrize("sentence_count", [3, 5, 6, 10])
+def test_quiz_batch_retries_every_bulk_miss(sentence_count):
+    client = FakeClient(bulk_fails=True)
+
+    mcqs = app.generate_quiz_batch(client, quiz_sentences(sentence_count), num_questions=min(5, sentence_count))
+
+    assert len(client.bulk_calls) == 1
+    assert len(client.single_calls) == min(5, sentence_count)
+    assert len(mcqs) == min(5, sentence_count)
+
+
+def test_quiz_batch_bulk_success_needs_no_retries():
+    client = FakeClient()
+
+    mcqs = app.generate_quiz_batch(client, quiz_sentences(10), num_questions=5)
+
+    assert len(client.bulk_calls) == 1
+    assert client.single_calls == []
+    assert len(mcqs) == 5
+
+
+class FailingAsyncClient:
+    """AsyncOpenAI stand-in whose every completion request fails."""
+
+    def __init__(self, api_key):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        raise RuntimeError("request failed")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def test_parallel_quiz_batch_retries_failed_points(monkeypatch):
+    monkeypatch.setattr(app, "AsyncOpenAI", FailingAsyncClient)
+    client = FakeClient()
+    client.api_key = "test-key"
+
+    mcqs = app.generate_quiz_batch(client, quiz_sentences(4), num_questions=4, parallel=True)
+
+    assert len(client.single_calls) == 4
+    assert len(mcqs) == 4
@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+import pytest
+
+import app
+
+
+def score(sentences):
+    encoded = [sentence.encode("utf-8") for sentence in sentences]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return app.score_sentences(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets).tolist()
+
+
+def sample_sentences():
+    good = [
+        f"Learning point {n} explains how the Water Cycle moves moisture between oceans, clouds and rivers over time."
+        for n in range(10)
+    ]
+    junk = ["ok", "!!!!!!!!", "zzzzzzzzzzzzzzzzzzzz", "see above", "---"]
+    return junk + good
+
+
+def test_score_sentences_kernel():
+    # Empty, all letters, a repeated run, and letters with a digit
+    assert score(["", "abc", "aaaa", "ab1d"]) == pytest.approx([0.0, 1.0, -1.5, 1.25])
+
+
+def test_score_sentences_rewards_fact_sized_sentences():
+    sentence = "The Water Cycle moves moisture between oceans, clouds and rivers over a very long time."
+    letters = sum(c.isalpha() for c in sentence)
+
+    assert score([sentence]) == pytest.approx([letters / len(sentence) + 2.0])
+
+
+def test_rank_learning_points_puts_prose_before_junk():
+    sentences = sample_sentences()
+
+    assert sorted(app.rank_learning_points(sentences, 10)) == list(range(5, 15))
+    assert app.rank_learning_points(sentences, 0) == []
+
+
+def test_pick_learning_points_samples_from_top_candidates():
+    sentences = sample_sentences()
+    candidates = app.rank_learning_points(sentences, 6)
+    random.seed(0)
+
+    picked = app.pick_learning_points(sentences, 3)
+
+    assert len(picked) == 3
+    assert picked == [i for i in candidates if i in picked]
+
+
+def test_pick_learning_points_varies_between_runs():
+    sentences = sample_sentences()
+    random.seed(0)
+
+    picks = {tuple(app.pick_learning_points(sentences, 3)) for _ in range(10)}
+
+    assert len(picks) > 1
+
+
+def test_pick_learning_points_keeps_everything_from_short_documents():
+    sentences = sample_sentences()[:4]
+
+    assert sorted(app.pick_learning_points(sentences, 5)) == [0, 1, 2, 3]